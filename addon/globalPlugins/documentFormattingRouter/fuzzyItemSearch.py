@@ -22,6 +22,7 @@ class FuzzyItemSearch:
             if categoryIndex  >= len(self.items)-1:
                 return
             categoryIndex += 1
+            itemIndex = 0
         while categoryIndex < len(self.items):
             if itemIndex == len(self.items[categoryIndex]):
                 categoryIndex += 1
@@ -54,14 +55,12 @@ class FuzzyItemSearch:
 
     def searchFirst(self):
         """ convenience method to search for the first item in the list."""
-        return self.searchFromHere(WorldState(0,0))
+        # Search forward from just before the first item, so an empty first category is skipped.
+        return self.searchForward(WorldState(0, -1))
 
     def searchLast(self):
-        # We really do not need a search back from here, it's only used in this func.
-        state = WorldState(len(self.items)-1, len(self.items[-1])-1)
-        if self.state_matches(state):
-            return state
-        return self.searchBackward(state)
+        # Search back from just past the last item, so an empty last category is skipped.
+        return self.searchBackward(WorldState(len(self.items)-1, len(self.items[-1])))
 
     def searchFromHere(self, state: WorldState):
         if self.state_matches(state):
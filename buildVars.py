@@ -67,6 +67,12 @@ i18nSources = pythonSources + ["buildVars.py"]
 # Paths are relative to the addon directory, not to the root directory of your addon sources.
 excludedFiles = []
 
+# Python version (major, minor) used by the targeted NVDA versions.
+# When the add-on is built with this Python version, bytecode for all python files is included in the bundle,
+# so NVDA does not need to compile the add-on on first load (or on every load from read-only profiles).
+# Set to None to only ship python sources.
+nvdaPythonVersion = (3, 11)
+
 # Base language for the NVDA add-on
 # If your add-on is written in a language other than english, modify this variable.
 # For example, set baseLanguage to "es" if your add-on is primarily written in spanish.
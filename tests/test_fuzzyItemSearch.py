@@ -0,0 +1,225 @@
+"""
+Differential tests for FuzzyItemSearch.
+
+The search engine is checked against a reference oracle, a frozen copy of the original index arithmetic,
+over randomly generated item tables and buffers. A faster search engine must keep passing these tests.
+"""
+
+import os
+import random
+import sys
+import types
+import unittest
+from typing import List, Optional
+
+# The add-on package imports NVDA modules in its __init__, so load the NVDA independent modules
+# through a stub package pointing at the add-on directory instead.
+_PACKAGE_NAME = "documentFormattingRouter"
+_PACKAGE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addon", "globalPlugins", _PACKAGE_NAME,
+)
+if _PACKAGE_NAME not in sys.modules:
+    _package = types.ModuleType(_PACKAGE_NAME)
+    _package.__path__ = [_PACKAGE_PATH]
+    sys.modules[_PACKAGE_NAME] = _package
+
+from documentFormattingRouter.fuzzyItemSearch import FuzzyItemSearch  # noqa: E402
+from documentFormattingRouter.types import FormattingItem, WorldState  # noqa: E402
+
+SEED = 20241019
+ITERATIONS = 500
+
+
+class ReferenceSearch:
+    """ Frozen copy of the original FuzzyItemSearch, used as the oracle.
+
+    Differences from the original, all of which made it crash or skip items:
+    - searchForward starts a new category at its first item, rather than at the index of the previous item.
+    - searchFirst/searchLast skip an empty first/last category instead of raising IndexError.
+    """
+
+    def __init__(self, buffer: str, items: List[List[FormattingItem]]):
+        self.buffer = buffer
+        self.items = items
+
+    def matches(self, itemText: str):
+        return self.buffer in itemText.lower()
+
+    def searchForward(self, worldState: WorldState) -> Optional[WorldState]:
+        categoryIndex = worldState.categoryIndex
+        itemIndex = worldState.itemIndex
+        if itemIndex < len(self.items[categoryIndex])-1:
+            itemIndex += 1
+        else:
+            if categoryIndex >= len(self.items)-1:
+                return
+            categoryIndex += 1
+            # Correction: the original kept itemIndex here.
+            itemIndex = 0
+        while categoryIndex < len(self.items):
+            if itemIndex == len(self.items[categoryIndex]):
+                categoryIndex += 1
+                itemIndex = 0
+                continue
+            item = self.items[categoryIndex][itemIndex]
+            if self.matches(item.name):
+                return WorldState(categoryIndex, itemIndex)
+            itemIndex += 1
+
+    def searchBackward(self, worldState: WorldState) -> Optional[WorldState]:
+        categoryIndex = worldState.categoryIndex
+        itemIndex = worldState.itemIndex
+        if itemIndex > 0:
+            itemIndex -= 1
+        else:
+            itemIndex = -1
+        while categoryIndex >= 0:
+            if itemIndex < 0:
+                categoryIndex -= 1
+                if categoryIndex < 0:
+                    return
+                itemIndex = len(self.items[categoryIndex])-1
+                continue
+            item = self.items[categoryIndex][itemIndex]
+            if self.matches(item.name):
+                return WorldState(categoryIndex, itemIndex)
+            itemIndex -= 1
+
+    def searchFirst(self):
+        # Correction: the original checked items[0][0] directly, which raised IndexError for an empty category.
+        state = WorldState(0, 0)
+        if self.items[0] and self.state_matches(state):
+            return state
+        return self.searchForward(state)
+
+    def searchLast(self):
+        # Correction: the original checked items[-1][-1] directly, which raised IndexError for an empty category.
+        state = WorldState(len(self.items)-1, len(self.items[-1])-1)
+        if self.items[-1] and self.state_matches(state):
+            return state
+        return self.searchBackward(WorldState(state.categoryIndex, max(state.itemIndex, 0)))
+
+    def state_matches(self, state: WorldState) -> bool:
+        return self.matches(self.items[state.categoryIndex][state.itemIndex].name)
+
+
+def allStates(items):
+    """ Every valid position in the table, in rotor order."""
+    return [
+        WorldState(categoryIndex, itemIndex)
+        for categoryIndex, category in enumerate(items)
+        for itemIndex in range(len(category))
+    ]
+
+
+def linearSearch(buffer, items, after=None, before=None):
+    """ Brute force search over allStates, used to check the oracle itself."""
+    matching = [
+        state for state in allStates(items)
+        if buffer in items[state.categoryIndex][state.itemIndex].name.lower()
+    ]
+    key = lambda state: (state.categoryIndex, state.itemIndex)  # noqa: E731
+    if after is not None:
+        matching = [state for state in matching if key(state) > key(after)]
+        return matching[0] if matching else None
+    if before is not None:
+        matching = [state for state in matching if key(state) < key(before)]
+        return matching[-1] if matching else None
+    return matching
+
+
+def randomTable(rng):
+    # A small alphabet keeps matches frequent, and empty or single item categories common.
+    return [
+        [
+            FormattingItem("".join(rng.choice("abAB ") for _ in range(rng.randint(1, 4))), index)
+            for index in range(rng.randint(0, 4))
+        ]
+        for _ in range(rng.randint(1, 5))
+    ]
+
+
+def randomBuffer(rng):
+    return "".join(rng.choice("ab ") for _ in range(rng.randint(1, 2)))
+
+
+def item(name):
+    return FormattingItem(name, name)
+
+
+class TestFuzzyItemSearchAgainstOracle(unittest.TestCase):
+
+    def assertSameResults(self, buffer, items):
+        engine = FuzzyItemSearch(buffer, items)
+        oracle = ReferenceSearch(buffer, items)
+        context = f"buffer={buffer!r} items={items!r}"
+        self.assertEqual(engine.searchFirst(), oracle.searchFirst(), context)
+        self.assertEqual(engine.searchLast(), oracle.searchLast(), context)
+        for state in allStates(items):
+            self.assertEqual(engine.searchForward(state), oracle.searchForward(state), f"{context} {state}")
+            self.assertEqual(engine.searchBackward(state), oracle.searchBackward(state), f"{context} {state}")
+
+    def test_randomTables(self):
+        rng = random.Random(SEED)
+        for _ in range(ITERATIONS):
+            self.assertSameResults(randomBuffer(rng), randomTable(rng))
+
+    def test_oracleMatchesLinearSearch(self):
+        rng = random.Random(SEED)
+        for _ in range(ITERATIONS):
+            buffer, items = randomBuffer(rng), randomTable(rng)
+            oracle = ReferenceSearch(buffer, items)
+            matching = linearSearch(buffer, items)
+            self.assertEqual(oracle.searchFirst(), matching[0] if matching else None)
+            self.assertEqual(oracle.searchLast(), matching[-1] if matching else None)
+            for state in allStates(items):
+                self.assertEqual(oracle.searchForward(state), linearSearch(buffer, items, after=state))
+                self.assertEqual(oracle.searchBackward(state), linearSearch(buffer, items, before=state))
+
+
+class TestFuzzyItemSearchEdgeCases(unittest.TestCase):
+
+    def test_searchFirst_skipsEmptyFirstCategory(self):
+        # This used to raise IndexError.
+        search = FuzzyItemSearch("a", [[], [item("a")]])
+        self.assertEqual(search.searchFirst(), WorldState(1, 0))
+
+    def test_searchLast_skipsEmptyLastCategory(self):
+        # This used to raise IndexError.
+        search = FuzzyItemSearch("a", [[item("a")], []])
+        self.assertEqual(search.searchLast(), WorldState(0, 0))
+
+    def test_searchForward_startsNextCategoryAtFirstItem(self):
+        # This used to skip the first items of the next category.
+        items = [[item("b"), item("b"), item("b")], [item("a"), item("b"), item("b"), item("a")]]
+        self.assertEqual(FuzzyItemSearch("a", items).searchForward(WorldState(0, 2)), WorldState(1, 0))
+
+    def test_searchForward_intoShorterCategory(self):
+        # This used to raise IndexError.
+        items = [[item("b"), item("b"), item("b")], [item("a")]]
+        self.assertEqual(FuzzyItemSearch("a", items).searchForward(WorldState(0, 2)), WorldState(1, 0))
+
+    def test_emptyCategoriesOnly(self):
+        search = FuzzyItemSearch("a", [[], []])
+        self.assertIsNone(search.searchFirst())
+        self.assertIsNone(search.searchLast())
+
+    def test_singleItemCategories(self):
+        search = FuzzyItemSearch("a", [[item("a")], [item("b")], [item("a")]])
+        self.assertEqual(search.searchForward(WorldState(0, 0)), WorldState(2, 0))
+        self.assertEqual(search.searchBackward(WorldState(2, 0)), WorldState(0, 0))
+
+    def test_noWrapAtEnds(self):
+        # The rotor wraps by calling searchFirst/searchLast when these return None.
+        search = FuzzyItemSearch("a", [[item("a"), item("b")], [item("b"), item("a")]])
+        self.assertIsNone(search.searchForward(WorldState(1, 1)))
+        self.assertIsNone(search.searchBackward(WorldState(0, 0)))
+
+    def test_matchIsCaseInsensitive(self):
+        search = FuzzyItemSearch("font", [[item("Font name")]])
+        self.assertEqual(search.searchFirst(), WorldState(0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()